@@ -1,40 +1,96 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, status
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import orjson
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
+import base64
+import concurrent.futures
+import hashlib
+import hmac
 import os
 import logging
+import time
 from pathlib import Path
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, PrivateAttr
 from typing import List, Optional, Dict, Any
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime
 import jwt
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerifyMismatchError
 from bson import ObjectId
+from bson.errors import InvalidId
+from cachetools import TTLCache
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection. Wire compression shrinks the text-heavy roadmap
+# payloads ~5x in transit; the server negotiates the first compressor it
+# supports and silently falls back to none. Pool bounds are env-tunable so
+# deployments can size them to the Mongo tier's connection budget.
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=int(os.environ.get('MONGO_MAX_POOL_SIZE', '200')),
+    minPoolSize=int(os.environ.get('MONGO_MIN_POOL_SIZE', '20')),
+    compressors="zstd,snappy,zlib",
+    zlibCompressionLevel=6,
+    serverSelectionTimeoutMS=2000,
+)
 db = client[os.environ['DB_NAME']]
 
-# Create the main app without a prefix
-app = FastAPI()
+# Create the main app without a prefix; orjson handles the nested roadmap
+# payloads far faster than the stdlib json encoder
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# CORS is registered before any routes are included. Origins come from the
+# environment (comma-separated) so production pins the frontend host; the
+# wildcard default is for local development. Credentials are only allowed
+# with pinned origins - the spec forbids combining them with "*" - and
+# max_age lets browsers cache preflights for a day instead of sending an
+# OPTIONS round-trip per request.
+CORS_ORIGINS = [o.strip() for o in os.environ.get('CORS_ORIGINS', '*').split(',') if o.strip()]
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=CORS_ORIGINS,
+    allow_credentials="*" not in CORS_ORIGINS,
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
+)
 
-# Create a router with the /api prefix
-api_router = APIRouter(prefix="/api")
+# Create a router with the /api prefix; routes added here inherit the
+# orjson response class rather than falling back to FastAPI's default
+api_router = APIRouter(prefix="/api", default_response_class=ORJSONResponse)
 
-# JWT Configuration
+# JWT Configuration. Key bytes and the algorithm list are derived once at
+# import so the per-request encode/decode path doesn't re-encode them.
 JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key-change-in-production')
 JWT_ALGORITHM = 'HS256'
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24 * 60  # 30 days
+_JWT_KEY = JWT_SECRET.encode('utf-8')
+_JWT_ALGORITHMS = [JWT_ALGORITHM]
 
 security = HTTPBearer()
 
+# Short-TTL cache of validated tokens so hot authenticated endpoints skip the
+# JWT verify + users lookup. Keyed by sha256(token); entries also carry their
+# own deadline so a token never outlives its exp claim. Failures are never cached.
+AUTH_CACHE_TTL = 30  # seconds
+_auth_cache: TTLCache = TTLCache(maxsize=10000, ttl=AUTH_CACHE_TTL)
+_auth_cache_lock = asyncio.Lock()
+
+# Shared by the users.email index and every email lookup: a query only uses
+# a collated index when it is issued with the same collation.
+EMAIL_COLLATION = {"locale": "en", "strength": 2}
+
 # Pydantic Models
 class UserCreate(BaseModel):
     name: str
@@ -52,6 +108,16 @@ class User(BaseModel):
     created_at: datetime
     selected_stream: Optional[str] = None
 
+    # BSON ObjectId carried alongside the string id so handlers don't
+    # re-parse the 24-char hex on every authenticated request
+    _oid: Optional[ObjectId] = PrivateAttr(default=None)
+
+    @property
+    def oid(self) -> ObjectId:
+        if self._oid is None:
+            self._oid = ObjectId(self.id)
+        return self._oid
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -62,6 +128,9 @@ class ProgressUpdate(BaseModel):
     step_id: str
     completed: bool
 
+class ProgressBatch(BaseModel):
+    items: List[ProgressUpdate]
+
 class UserProgress(BaseModel):
     user_id: str
     career_id: str
@@ -78,60 +147,183 @@ class CareerRoadmap(BaseModel):
     estimated_duration: str
     difficulty_level: str
 
-# Helper Functions
-def hash_password(password: str) -> str:
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+class CareerRoadmapSummary(BaseModel):
+    # List-view shape: the nested steps (with per-step resources) stay on
+    # GET /roadmaps/{id}; the list only carries their count
+    id: str
+    title: str
+    stream: str
+    description: str
+    steps_count: int
+    estimated_duration: str
+    difficulty_level: str
+
+# Password hashing: Argon2id at the OWASP baseline (memory-hard against GPU
+# cracking and considerably cheaper per login than bcrypt at cost 12). The
+# hasher is instantiated once so every call reuses the prepared context.
+# Hashes written before this migration start with $2b$ and are still
+# verified with bcrypt, then transparently rehashed on successful login.
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=19 * 1024, parallelism=1)
 
-def verify_password(password: str, hashed: str) -> bool:
+# Dedicated pool for password hashing so the CPU-heavy hash/verify calls run
+# off the event loop and don't compete with motor's use of the default executor.
+_hash_executor = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Helper Functions
+def _verify_password_sync(password: str, hashed: str) -> bool:
+    # Both verifiers compare in constant time. If a token or secret ever
+    # needs a direct string comparison here, use hmac.compare_digest - a
+    # plain == would leak timing information.
+    if hashed.startswith('$argon2'):
+        try:
+            return _password_hasher.verify(hashed, password)
+        except (VerifyMismatchError, InvalidHashError):
+            return False
+    # Legacy bcrypt hash from before the Argon2id migration
     return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
 
+async def hash_password(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_executor, _password_hasher.hash, password
+    )
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_executor, _verify_password_sync, password, hashed
+    )
+
+# Roadmaps are seeded once via /admin/init-roadmaps and never mutated
+# afterwards, so the step counts used by progress updates and the full list
+# served by GET /roadmaps can live in process memory.
+ROADMAP_STEP_COUNTS: Dict[str, int] = {}
+_roadmap_list_json: Optional[bytes] = None  # pre-serialized GET /roadmaps body
+
+# Serialized response bodies for stream-filtered lists and single roadmaps,
+# keyed by stream name or "id:<roadmap_id>". The TTL is a safety net; the
+# cache is cleared outright whenever the seed data is rewritten.
+_roadmap_response_cache: TTLCache = TTLCache(maxsize=64, ttl=300)
+
+async def refresh_roadmap_cache():
+    global _roadmap_list_json
+    _roadmap_response_cache.clear()
+    counts: Dict[str, int] = {}
+    docs: List[Dict[str, Any]] = []
+    async for doc in db.roadmaps.find({}):
+        roadmap_id = str(doc.pop("_id"))
+        steps_count = len(doc.pop("steps", []))
+        counts[roadmap_id] = steps_count
+        docs.append({"id": roadmap_id, "steps_count": steps_count, **doc})
+    ROADMAP_STEP_COUNTS.clear()
+    ROADMAP_STEP_COUNTS.update(counts)
+    _roadmap_list_json = orjson.dumps(docs) if docs else None
+
+async def get_total_steps(career_id: str) -> int:
+    total_steps = ROADMAP_STEP_COUNTS.get(career_id)
+    if total_steps is not None:
+        return total_steps
+
+    # Cache miss (e.g. roadmap seeded after startup): fetch just the step
+    # count with a computed projection instead of the whole nested document.
+    try:
+        roadmap_oid = ObjectId(career_id)
+    except InvalidId:
+        return 0
+    doc = await db.roadmaps.find_one(
+        {"_id": roadmap_oid},
+        projection={"_id": 0, "steps_count": {"$size": {"$ifNull": ["$steps", []]}}}
+    )
+    if doc is None:
+        return 0
+    ROADMAP_STEP_COUNTS[career_id] = doc["steps_count"]
+    return doc["steps_count"]
+
+# The header never changes, so its base64url form is a module constant
+_JWT_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b'=')
+
 def create_jwt_token(user_id: str) -> str:
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode = {"sub": user_id, "exp": expire}
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
-    return encoded_jwt
+    # Hand-rolled HS256 encode: orjson for the payload, hashlib's OpenSSL
+    # HMAC for the signature - every hot loop runs in C instead of PyJWT's
+    # Python json/base64 plumbing. Output is a standard JWT; the verify
+    # path still goes through jwt.decode.
+    expire = int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    payload_b64 = base64.urlsafe_b64encode(
+        orjson.dumps({"sub": user_id, "exp": expire})
+    ).rstrip(b'=')
+    signing_input = _JWT_HEADER_B64 + b'.' + payload_b64
+    signature_b64 = base64.urlsafe_b64encode(
+        hmac.new(_JWT_KEY, signing_input, hashlib.sha256).digest()
+    ).rstrip(b'=')
+    return (signing_input + b'.' + signature_b64).decode('ascii')
+
+# Only the claims we issue are checked; aud/iss validation would be wasted
+# work since create_jwt_token never sets them.
+_JWT_DECODE_OPTIONS = {"require": ["exp", "sub"], "verify_aud": False, "verify_iss": False}
+
+async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    cache_key = hashlib.sha256(credentials.credentials.encode('utf-8')).digest()
+    async with _auth_cache_lock:
+        cached = _auth_cache.get(cache_key)
+    if cached is not None:
+        user, payload, deadline = cached
+        if time.time() < deadline:
+            request.state.jwt_payload = payload
+            return user
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
-        payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(
+            credentials.credentials, _JWT_KEY,
+            algorithms=_JWT_ALGORITHMS, options=_JWT_DECODE_OPTIONS
+        )
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
-    
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if user is None:
+
+    # Downstream dependencies can reuse the verified claims without redecoding
+    request.state.jwt_payload = payload
+
+    user_doc = await db.users.find_one({"_id": ObjectId(user_id)})
+    if user_doc is None:
         raise HTTPException(status_code=401, detail="User not found")
-    
-    return User(
-        id=str(user["_id"]),
-        name=user["name"],
-        email=user["email"],
-        created_at=user["created_at"],
-        selected_stream=user.get("selected_stream")
+
+    user = User(
+        id=str(user_doc["_id"]),
+        name=user_doc["name"],
+        email=user_doc["email"],
+        created_at=user_doc["created_at"],
+        selected_stream=user_doc.get("selected_stream")
     )
+    user._oid = user_doc["_id"]
+
+    # Cap the entry lifetime at the token's own expiry so a token that is
+    # about to expire can't be served from cache past its exp claim.
+    deadline = min(payload["exp"], time.time() + AUTH_CACHE_TTL)
+    async with _auth_cache_lock:
+        _auth_cache[cache_key] = (user, payload, deadline)
+
+    return user
 
 # Authentication Routes
 @api_router.post("/auth/register", response_model=Token)
 async def register(user_data: UserCreate):
-    # Check if user already exists
-    existing_user = await db.users.find_one({"email": user_data.email})
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    # Hash password and create user
-    hashed_password = hash_password(user_data.password)
+    # Hash password and create user; the unique index on email turns the
+    # old find_one existence check into a duplicate-key error on insert.
+    hashed_password = await hash_password(user_data.password)
+    # Normalize at write time so A@x.com and a@x.com can't become two accounts
+    email = user_data.email.lower()
     user_doc = {
         "name": user_data.name,
-        "email": user_data.email,
+        "email": email,
         "password": hashed_password,
         "created_at": datetime.utcnow(),
         "selected_stream": None
     }
-    
-    result = await db.users.insert_one(user_doc)
+
+    try:
+        result = await db.users.insert_one(user_doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
     user_id = str(result.inserted_id)
     
     # Create JWT token
@@ -140,7 +332,7 @@ async def register(user_data: UserCreate):
     user = User(
         id=user_id,
         name=user_data.name,
-        email=user_data.email,
+        email=email,
         created_at=user_doc["created_at"]
     )
     
@@ -148,11 +340,23 @@ async def register(user_data: UserCreate):
 
 @api_router.post("/auth/login", response_model=Token)
 async def login(user_data: UserLogin):
-    # Find user by email
-    user_doc = await db.users.find_one({"email": user_data.email})
-    if not user_doc or not verify_password(user_data.password, user_doc["password"]):
+    # Find user by email (stored lowercase; see register). The collation must
+    # match the index's, or Mongo falls back to a collection scan.
+    user_doc = await db.users.find_one(
+        {"email": user_data.email.lower()}, collation=EMAIL_COLLATION
+    )
+    if not user_doc or not await verify_password(user_data.password, user_doc["password"]):
         raise HTTPException(status_code=401, detail="Invalid email or password")
-    
+
+    # Rolling migration: upgrade legacy bcrypt hashes to Argon2id while we
+    # hold the verified plaintext
+    if not user_doc["password"].startswith('$argon2'):
+        new_hash = await hash_password(user_data.password)
+        await db.users.update_one(
+            {"_id": user_doc["_id"]},
+            {"$set": {"password": new_hash}}
+        )
+
     # Create JWT token
     access_token = create_jwt_token(str(user_doc["_id"]))
     
@@ -178,368 +382,533 @@ async def update_stream(stream_data: dict, current_user: User = Depends(get_curr
         raise HTTPException(status_code=400, detail="Invalid stream")
     
     await db.users.update_one(
-        {"_id": ObjectId(current_user.id)},
+        {"_id": current_user.oid},
         {"$set": {"selected_stream": stream}}
     )
-    
+
+    # Drop this user's cached auth entries so the next authenticated request
+    # sees the new stream instead of a stale User for up to AUTH_CACHE_TTL
+    async with _auth_cache_lock:
+        stale_keys = [
+            key for key, (user, _, _) in _auth_cache.items()
+            if user.id == current_user.id
+        ]
+        for key in stale_keys:
+            del _auth_cache[key]
+
     return {"message": "Stream updated successfully", "stream": stream}
 
 # Career Roadmaps Routes
-@api_router.get("/roadmaps", response_model=List[CareerRoadmap])
+# List-view projection: everything except the heavy nested steps array,
+# whose length is computed server-side
+_ROADMAP_LIST_PROJECTION = {
+    "title": 1,
+    "stream": 1,
+    "description": 1,
+    "estimated_duration": 1,
+    "difficulty_level": 1,
+    "steps_count": {"$size": {"$ifNull": ["$steps", []]}},
+}
+
+@api_router.get("/roadmaps", response_model=List[CareerRoadmapSummary])
 async def get_roadmaps(stream: Optional[str] = None):
+    if stream is None and _roadmap_list_json is not None:
+        # Zero per-request encoding: the full list is serialized once at
+        # startup/seed time and served as raw bytes
+        return Response(content=_roadmap_list_json, media_type="application/json")
+
+    cached = _roadmap_response_cache.get(stream)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     query = {}
     if stream:
         query["stream"] = stream
-    
-    roadmaps = await db.roadmaps.find(query).to_list(1000)
-    return [CareerRoadmap(**{**roadmap, "id": str(roadmap["_id"])}) for roadmap in roadmaps]
+
+    # Stream the JSON array straight off the cursor: O(1) memory per request
+    # and first bytes go out after the first Mongo batch. The chunks are
+    # collected on the side so the next request for this stream is a cache hit.
+    async def generate():
+        parts = [b"["]
+        yield b"["
+        first = True
+        async for doc in db.roadmaps.find(query, projection=_ROADMAP_LIST_PROJECTION):
+            if not first:
+                parts.append(b",")
+                yield b","
+            first = False
+            doc["id"] = str(doc.pop("_id"))
+            chunk = orjson.dumps(doc)
+            parts.append(chunk)
+            yield chunk
+        parts.append(b"]")
+        yield b"]"
+        _roadmap_response_cache[stream] = b"".join(parts)
+
+    return StreamingResponse(generate(), media_type="application/json")
 
 @api_router.get("/roadmaps/{roadmap_id}", response_model=CareerRoadmap)
 async def get_roadmap(roadmap_id: str):
+    cache_key = f"id:{roadmap_id}"
+    cached = _roadmap_response_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # Validate the id before hitting Mongo: malformed ids (bots, scanners)
+    # fail fast without a round-trip, and nothing else gets swallowed by a
+    # blanket except
     try:
-        roadmap = await db.roadmaps.find_one({"_id": ObjectId(roadmap_id)})
-        if not roadmap:
-            raise HTTPException(status_code=404, detail="Roadmap not found")
-        return CareerRoadmap(**{**roadmap, "id": str(roadmap["_id"])})
-    except:
+        roadmap_oid = ObjectId(roadmap_id)
+    except InvalidId:
+        raise HTTPException(status_code=404, detail="Roadmap not found")
+
+    roadmap = await db.roadmaps.find_one({"_id": roadmap_oid})
+    if not roadmap:
         raise HTTPException(status_code=404, detail="Roadmap not found")
 
+    roadmap["id"] = str(roadmap.pop("_id"))
+    body = orjson.dumps(roadmap)
+    _roadmap_response_cache[cache_key] = body
+    return Response(content=body, media_type="application/json")
+
 # Progress Tracking Routes
+async def _build_progress_op(user: User, progress_data: ProgressUpdate) -> UpdateOne:
+    # Mutate completed_steps server-side in one atomic upsert instead of the
+    # old find_one -> mutate -> update_one dance (two round-trips and a
+    # lost-update race when a user taps two steps quickly).
+    total_steps = await get_total_steps(progress_data.career_id)
+
+    if progress_data.completed:
+        steps_expr = {"$setUnion": [
+            {"$ifNull": ["$completed_steps", []]},
+            [{"$literal": progress_data.step_id}]
+        ]}
+    else:
+        steps_expr = {"$filter": {
+            "input": {"$ifNull": ["$completed_steps", []]},
+            "cond": {"$ne": ["$$this", {"$literal": progress_data.step_id}]}
+        }}
+
+    # Second $set stage sees the updated completed_steps, so the percentage
+    # is computed from the post-update list in the same round-trip.
+    pipeline = [
+        {"$set": {
+            "completed_steps": steps_expr,
+            "last_updated": datetime.utcnow()
+        }},
+        {"$set": {
+            "progress_percentage": (
+                {"$multiply": [{"$divide": [{"$size": "$completed_steps"}, total_steps]}, 100]}
+                if total_steps > 0 else 0.0
+            )
+        }}
+    ]
+
+    return UpdateOne(
+        {"user_id": user.oid, "career_id": progress_data.career_id},
+        pipeline,
+        upsert=True
+    )
+
 @api_router.post("/progress")
 async def update_progress(
     progress_data: ProgressUpdate,
     current_user: User = Depends(get_current_user)
 ):
-    # Get existing progress or create new
-    existing_progress = await db.progress.find_one({
-        "user_id": current_user.id,
-        "career_id": progress_data.career_id
-    })
-    
-    if existing_progress:
-        completed_steps = existing_progress.get("completed_steps", [])
-        if progress_data.completed and progress_data.step_id not in completed_steps:
-            completed_steps.append(progress_data.step_id)
-        elif not progress_data.completed and progress_data.step_id in completed_steps:
-            completed_steps.remove(progress_data.step_id)
-        
-        # Get roadmap to calculate progress percentage
-        roadmap = await db.roadmaps.find_one({"_id": ObjectId(progress_data.career_id)})
-        total_steps = len(roadmap.get("steps", [])) if roadmap else 0
-        progress_percentage = (len(completed_steps) / total_steps * 100) if total_steps > 0 else 0
-        
-        await db.progress.update_one(
-            {"_id": existing_progress["_id"]},
-            {"$set": {
-                "completed_steps": completed_steps,
-                "progress_percentage": progress_percentage,
-                "last_updated": datetime.utcnow()
-            }}
-        )
-    else:
-        completed_steps = [progress_data.step_id] if progress_data.completed else []
-        roadmap = await db.roadmaps.find_one({"_id": ObjectId(progress_data.career_id)})
-        total_steps = len(roadmap.get("steps", [])) if roadmap else 0
-        progress_percentage = (len(completed_steps) / total_steps * 100) if total_steps > 0 else 0
-        
-        progress_doc = {
-            "user_id": current_user.id,
-            "career_id": progress_data.career_id,
-            "completed_steps": completed_steps,
-            "progress_percentage": progress_percentage,
-            "last_updated": datetime.utcnow()
-        }
-        await db.progress.insert_one(progress_doc)
-    
+    op = await _build_progress_op(current_user, progress_data)
+    await db.progress.bulk_write([op], ordered=False)
     return {"message": "Progress updated successfully"}
 
+@api_router.post("/progress/batch")
+async def update_progress_batch(
+    progress_batch: ProgressBatch,
+    current_user: User = Depends(get_current_user)
+):
+    # A session's worth of step completions lands as one unordered
+    # bulk_write: N updates, one wire round-trip. Ops touching the same
+    # progress doc are serialized by Mongo and each recomputes the
+    # percentage from the doc it sees, so ordering doesn't matter.
+    if not progress_batch.items:
+        raise HTTPException(status_code=400, detail="No progress updates provided")
+
+    ops = [
+        await _build_progress_op(current_user, item)
+        for item in progress_batch.items
+    ]
+    await db.progress.bulk_write(ops, ordered=False)
+    return {"message": f"Updated {len(ops)} progress entries successfully"}
+
 @api_router.get("/progress", response_model=List[UserProgress])
 async def get_user_progress(current_user: User = Depends(get_current_user)):
-    progress_docs = await db.progress.find({"user_id": current_user.id}).to_list(1000)
-    return [UserProgress(**progress) for progress in progress_docs]
+    # user_id is stored as an ObjectId (12 bytes vs a 24-char string in the
+    # index); _id is projected out since UserProgress doesn't expose it.
+    async def generate():
+        yield b"["
+        first = True
+        async for doc in db.progress.find({"user_id": current_user.oid}, {"_id": 0}):
+            if not first:
+                yield b","
+            first = False
+            doc["user_id"] = str(doc["user_id"])
+            yield orjson.dumps(doc)
+        yield b"]"
+
+    return StreamingResponse(generate(), media_type="application/json")
 
 @api_router.get("/progress/{career_id}")
 async def get_career_progress(career_id: str, current_user: User = Depends(get_current_user)):
-    progress = await db.progress.find_one({
-        "user_id": current_user.id,
-        "career_id": career_id
-    })
+    # One aggregation joins the roadmap's step count and computes the
+    # percentage next to the data, so the response always reflects the
+    # current roadmap even if its steps changed after the last write. The
+    # $convert guards against progress rows whose career_id was never a
+    # valid ObjectId.
+    pipeline = [
+        {"$match": {"user_id": current_user.oid, "career_id": career_id}},
+        {"$lookup": {
+            "from": "roadmaps",
+            "let": {"cid": {"$convert": {"input": "$career_id", "to": "objectId", "onError": None}}},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$_id", "$$cid"]}}},
+                {"$project": {"_id": 0, "steps_count": {"$size": {"$ifNull": ["$steps", []]}}}}
+            ],
+            "as": "roadmap"
+        }},
+        {"$project": {
+            "_id": 0,
+            "user_id": 1,
+            "career_id": 1,
+            "completed_steps": 1,
+            "last_updated": 1,
+            "progress_percentage": {
+                "$let": {
+                    "vars": {"total": {"$ifNull": [{"$first": "$roadmap.steps_count"}, 0]}},
+                    "in": {"$cond": [
+                        {"$gt": ["$$total", 0]},
+                        {"$multiply": [
+                            {"$divide": [{"$size": {"$ifNull": ["$completed_steps", []]}}, "$$total"]},
+                            100
+                        ]},
+                        0.0
+                    ]}
+                }
+            }
+        }}
+    ]
+    docs = await db.progress.aggregate(pipeline).to_list(length=1)
+
+    # Returning the Mongo dict via ORJSONResponse skips jsonable_encoder's
+    # recursive object walk; orjson handles the datetime natively
+    if not docs:
+        return ORJSONResponse({
+            "user_id": current_user.id,
+            "career_id": career_id,
+            "completed_steps": [],
+            "progress_percentage": 0.0,
+            "last_updated": datetime.utcnow()
+        })
+
+    progress = docs[0]
+    progress["user_id"] = str(progress["user_id"])
+    return ORJSONResponse(progress)
+
+# Seed career roadmaps. Built once at import so the admin init endpoint
+# doesn't reconstruct hundreds of dicts inside the request path.
+ROADMAPS_DATA = [
+    # Science Stream
+    {
+        "title": "Full Stack Developer",
+        "stream": "Science",
+        "description": "Complete path to becoming a full-stack web developer with modern technologies",
+        "estimated_duration": "12-18 months",
+        "difficulty_level": "Intermediate",
+        "steps": [
+            {"id": "1", "title": "Learn HTML & CSS Basics", "description": "Master HTML5 and CSS3 fundamentals", "resources": ["https://www.freecodecamp.org/", "https://developer.mozilla.org/"], "duration": "4-6 weeks"},
+            {"id": "2", "title": "JavaScript Fundamentals", "description": "Learn core JavaScript concepts", "resources": ["https://javascript.info/", "https://www.coursera.org/"], "duration": "6-8 weeks"},
+            {"id": "3", "title": "React.js", "description": "Build interactive user interfaces", "resources": ["https://reactjs.org/", "https://www.unacademy.com/"], "duration": "8-10 weeks"},
+            {"id": "4", "title": "Backend with Node.js", "description": "Server-side development", "resources": ["https://nodejs.org/", "https://swayam.gov.in/"], "duration": "6-8 weeks"},
+            {"id": "5", "title": "Database Management", "description": "Learn MongoDB and SQL", "resources": ["https://university.mongodb.com/", "https://www.coursera.org/"], "duration": "4-6 weeks"},
+            {"id": "6", "title": "Build Portfolio Projects", "description": "Create 3-5 full-stack applications", "resources": ["https://github.com/", "https://netlify.com/"], "duration": "8-12 weeks"}
+        ]
+    },
+    {
+        "title": "Data Scientist",
+        "stream": "Science", 
+        "description": "Become a data scientist with Python, ML, and analytics skills",
+        "estimated_duration": "15-24 months",
+        "difficulty_level": "Advanced",
+        "steps": [
+            {"id": "1", "title": "Python Programming", "description": "Master Python for data science", "resources": ["https://www.python.org/", "https://swayam.gov.in/"], "duration": "6-8 weeks"},
+            {"id": "2", "title": "Statistics & Mathematics", "description": "Linear algebra, calculus, statistics", "resources": ["https://www.khanacademy.org/", "https://www.coursera.org/"], "duration": "10-12 weeks"},
+            {"id": "3", "title": "Data Analysis Libraries", "description": "Pandas, NumPy, Matplotlib", "resources": ["https://pandas.pydata.org/", "https://www.unacademy.com/"], "duration": "6-8 weeks"},
+            {"id": "4", "title": "Machine Learning", "description": "Scikit-learn, supervised/unsupervised learning", "resources": ["https://scikit-learn.org/", "https://www.coursera.org/"], "duration": "12-16 weeks"},
+            {"id": "5", "title": "Deep Learning", "description": "Neural networks, TensorFlow/PyTorch", "resources": ["https://www.tensorflow.org/", "https://pytorch.org/"], "duration": "10-12 weeks"},
+            {"id": "6", "title": "Real Projects & Portfolio", "description": "Build data science projects", "resources": ["https://kaggle.com/", "https://github.com/"], "duration": "8-10 weeks"}
+        ]
+    },
+    {
+        "title": "Doctor (MBBS)",
+        "stream": "Science",
+        "description": "Medical career path through NEET and MBBS program",
+        "estimated_duration": "6-8 years",
+        "difficulty_level": "Advanced",
+        "steps": [
+            {"id": "1", "title": "Class 12 PCB", "description": "Physics, Chemistry, Biology with 90%+", "resources": ["https://ncert.nic.in/", "https://www.unacademy.com/"], "duration": "2 years"},
+            {"id": "2", "title": "NEET Preparation", "description": "Qualify NEET-UG exam", "resources": ["https://www.nta.ac.in/", "https://www.aakash.ac.in/"], "duration": "1-2 years"},
+            {"id": "3", "title": "MBBS Degree", "description": "5.5 years medical program", "resources": ["https://www.mciindia.org/", "Medical Colleges"], "duration": "5.5 years"},
+            {"id": "4", "title": "Internship", "description": "1 year mandatory internship", "resources": ["Teaching Hospitals", "Medical Institutions"], "duration": "1 year"},
+            {"id": "5", "title": "Medical Registration", "description": "Register with Medical Council", "resources": ["https://www.nmc.org.in/"], "duration": "3-6 months"},
+            {"id": "6", "title": "Specialization (Optional)", "description": "MD/MS through NEET-PG", "resources": ["https://www.nta.ac.in/", "Post Graduate Medical Colleges"], "duration": "3 years"}
+        ]
+    },
+    {
+        "title": "Engineer",
+        "stream": "Science",
+        "description": "Engineering career through JEE and B.Tech program",
+        "estimated_duration": "4-6 years",
+        "difficulty_level": "Intermediate",
+        "steps": [
+            {"id": "1", "title": "Class 12 PCM", "description": "Physics, Chemistry, Mathematics", "resources": ["https://ncert.nic.in/", "https://www.unacademy.com/"], "duration": "2 years"},
+            {"id": "2", "title": "JEE Preparation", "description": "JEE Main & Advanced preparation", "resources": ["https://www.nta.ac.in/", "https://www.fiitjee.com/"], "duration": "1-2 years"},
+            {"id": "3", "title": "B.Tech Degree", "description": "4-year engineering program", "resources": ["IITs", "NITs", "Engineering Colleges"], "duration": "4 years"},
+            {"id": "4", "title": "Internships & Projects", "description": "Gain practical experience", "resources": ["Industry Partners", "Research Labs"], "duration": "During B.Tech"},
+            {"id": "5", "title": "Technical Skills", "description": "Programming, design, analysis", "resources": ["https://www.coursera.org/", "https://swayam.gov.in/"], "duration": "Continuous"},
+            {"id": "6", "title": "Job/Higher Studies", "description": "Placement or M.Tech/MS", "resources": ["Campus Placements", "Gate Preparation"], "duration": "Final Year"}
+        ]
+    },
+    {
+        "title": "Biotechnologist",
+        "stream": "Science",
+        "description": "Career in biotechnology and life sciences",
+        "estimated_duration": "4-6 years",
+        "difficulty_level": "Intermediate",
+        "steps": [
+            {"id": "1", "title": "Class 12 PCB/PCM", "description": "Biology focus with chemistry", "resources": ["https://ncert.nic.in/", "https://www.unacademy.com/"], "duration": "2 years"},
+            {"id": "2", "title": "Entrance Exams", "description": "JEE Main, BITSAT, or university exams", "resources": ["https://www.nta.ac.in/", "University Websites"], "duration": "1 year"},
+            {"id": "3", "title": "B.Tech/B.Sc Biotechnology", "description": "Undergraduate degree in biotechnology", "resources": ["IITs", "NITs", "Biotechnology Colleges"], "duration": "4 years"},
+            {"id": "4", "title": "Laboratory Skills", "description": "Practical lab techniques", "resources": ["College Labs", "Industry Training"], "duration": "During Degree"},
+            {"id": "5", "title": "Research Projects", "description": "Undergraduate research experience", "resources": ["Research Institutes", "CSIR Labs"], "duration": "1-2 years"},
+            {"id": "6", "title": "Specialization/Job", "description": "M.Tech or industry position", "resources": ["GATE", "Campus Placements"], "duration": "2+ years"}
+        ]
+    },
     
-    if not progress:
-        return UserProgress(
-            user_id=current_user.id,
-            career_id=career_id,
-            completed_steps=[],
-            progress_percentage=0.0,
-            last_updated=datetime.utcnow()
-        )
+    # Commerce Stream
+    {
+        "title": "Chartered Accountant",
+        "stream": "Commerce",
+        "description": "Professional CA qualification through ICAI",
+        "estimated_duration": "4-6 years",
+        "difficulty_level": "Advanced",
+        "steps": [
+            {"id": "1", "title": "Class 12 Commerce", "description": "Accountancy, Business Studies, Economics", "resources": ["https://ncert.nic.in/", "https://www.unacademy.com/"], "duration": "2 years"},
+            {"id": "2", "title": "CA Foundation", "description": "Entry level CA examination", "resources": ["https://www.icai.org/", "CA Coaching Institutes"], "duration": "6-12 months"},
+            {"id": "3", "title": "CA Intermediate", "description": "Middle level CA examination", "resources": ["https://www.icai.org/", "Self Study + Coaching"], "duration": "12-18 months"},
+            {"id": "4", "title": "Articleship Training", "description": "3 years practical training", "resources": ["CA Firms", "Corporate Houses"], "duration": "3 years"},
+            {"id": "5", "title": "CA Final", "description": "Final level CA examination", "resources": ["https://www.icai.org/", "Advanced Study"], "duration": "6-18 months"},
+            {"id": "6", "title": "Membership & Practice", "description": "ICAI membership and career start", "resources": ["https://www.icai.org/", "CA Firms"], "duration": "Ongoing"}
+        ]
+    },
+    {
+        "title": "Investment Banker",
+        "stream": "Commerce",
+        "description": "Career in investment banking and finance",
+        "estimated_duration": "4-6 years",
+        "difficulty_level": "Advanced",
+        "steps": [
+            {"id": "1", "title": "Bachelor's Degree", "description": "B.Com, BBA, or Economics", "resources": ["Commerce Colleges", "Universities"], "duration": "3 years"},
+            {"id": "2", "title": "Financial Knowledge", "description": "Learn markets, valuation, modeling", "resources": ["https://www.coursera.org/", "https://www.cfa institute.org/"], "duration": "1-2 years"},
+            {"id": "3", "title": "MBA/Finance Specialization", "description": "Master's in Finance/MBA", "resources": ["IIMs", "Top B-Schools"], "duration": "2 years"},
+            {"id": "4", "title": "Internships", "description": "Investment banking internships", "resources": ["Goldman Sachs", "Morgan Stanley", "Local Banks"], "duration": "Summer Terms"},
+            {"id": "5", "title": "Certifications", "description": "CFA, FRM certifications", "resources": ["https://www.cfainstitute.org/", "https://www.garp.org/"], "duration": "1-3 years"},
+            {"id": "6", "title": "Full-time Position", "description": "Analyst/Associate role", "resources": ["Investment Banks", "Financial Services"], "duration": "Career Start"}
+        ]
+    },
+    {
+        "title": "Business Analyst",
+        "stream": "Commerce",
+        "description": "Business analysis and consulting career",
+        "estimated_duration": "3-5 years",
+        "difficulty_level": "Intermediate",
+        "steps": [
+            {"id": "1", "title": "Bachelor's Degree", "description": "BBA, B.Com, or related field", "resources": ["Business Schools", "Universities"], "duration": "3 years"},
+            {"id": "2", "title": "Business Analysis Skills", "description": "Process mapping, requirements analysis", "resources": ["https://www.coursera.org/", "https://www.iiba.org/"], "duration": "6-12 months"},
+            {"id": "3", "title": "Technical Skills", "description": "SQL, Excel, Data Analysis tools", "resources": ["https://www.microsoft.com/", "https://www.tableau.com/"], "duration": "3-6 months"},
+            {"id": "4", "title": "Industry Experience", "description": "Internships and entry-level roles", "resources": ["Consulting Firms", "Corporations"], "duration": "1-2 years"},
+            {"id": "5", "title": "Certifications", "description": "CBAP, PMI-PBA certifications", "resources": ["https://www.iiba.org/", "https://www.pmi.org/"], "duration": "6-12 months"},
+            {"id": "6", "title": "Senior Roles", "description": "Senior BA or consultancy positions", "resources": ["Career Progression", "Networking"], "duration": "Ongoing"}
+        ]
+    },
+    {
+        "title": "Marketing Manager",
+        "stream": "Commerce",
+        "description": "Digital and traditional marketing career path",
+        "estimated_duration": "4-6 years",
+        "difficulty_level": "Intermediate",
+        "steps": [
+            {"id": "1", "title": "Bachelor's Degree", "description": "Marketing, BBA, Mass Communication", "resources": ["Business Schools", "Universities"], "duration": "3 years"},
+            {"id": "2", "title": "Digital Marketing Skills", "description": "SEO, SEM, Social Media Marketing", "resources": ["https://www.google.com/skillshop/", "https://www.hubspot.com/"], "duration": "3-6 months"},
+            {"id": "3", "title": "Marketing Analytics", "description": "Google Analytics, Marketing metrics", "resources": ["https://analytics.google.com/", "https://www.coursera.org/"], "duration": "2-4 months"},
+            {"id": "4", "title": "Industry Experience", "description": "Marketing executive/coordinator roles", "resources": ["Marketing Agencies", "Corporate Marketing"], "duration": "2-3 years"},
+            {"id": "5", "title": "Specialization", "description": "Brand, Digital, or Product Marketing", "resources": ["https://www.unacademy.com/", "Professional Courses"], "duration": "1-2 years"},
+            {"id": "6", "title": "Leadership Role", "description": "Marketing Manager position", "resources": ["Career Growth", "MBA Optional"], "duration": "Ongoing"}
+        ]
+    },
+    {
+        "title": "Entrepreneur",
+        "stream": "Commerce",
+        "description": "Start and scale your own business",
+        "estimated_duration": "Varies (3+ years)",
+        "difficulty_level": "Advanced",
+        "steps": [
+            {"id": "1", "title": "Business Education", "description": "BBA, B.Com or relevant field", "resources": ["Business Schools", "Online Courses"], "duration": "3 years"},
+            {"id": "2", "title": "Idea Development", "description": "Identify market opportunity", "resources": ["https://www.startupindia.gov.in/", "Market Research"], "duration": "3-6 months"},
+            {"id": "3", "title": "Business Plan", "description": "Create comprehensive business plan", "resources": ["https://www.score.org/", "Business Plan Tools"], "duration": "2-4 months"},
+            {"id": "4", "title": "Funding & Setup", "description": "Secure funding and legal setup", "resources": ["Angel Investors", "https://www.startupindia.gov.in/"], "duration": "3-12 months"},
+            {"id": "5", "title": "Launch & Operations", "description": "Launch product/service and operations", "resources": ["Incubators", "Mentorship Programs"], "duration": "6-18 months"},
+            {"id": "6", "title": "Scale & Growth", "description": "Expand business and scale operations", "resources": ["Business Networks", "Growth Strategies"], "duration": "Ongoing"}
+        ]
+    },
     
-    return UserProgress(**progress)
+    # Arts Stream
+    {
+        "title": "Teacher",
+        "stream": "Arts",
+        "description": "Teaching career in schools and higher education",
+        "estimated_duration": "4-6 years",
+        "difficulty_level": "Intermediate",
+        "steps": [
+            {"id": "1", "title": "Bachelor's Degree", "description": "BA in subject of interest", "resources": ["Universities", "Arts Colleges"], "duration": "3 years"},
+            {"id": "2", "title": "B.Ed Degree", "description": "Bachelor of Education", "resources": ["Education Colleges", "Universities"], "duration": "2 years"},
+            {"id": "3", "title": "Teaching Practice", "description": "Student teaching and practice", "resources": ["Practice Schools", "Internship Programs"], "duration": "During B.Ed"},
+            {"id": "4", "title": "Qualification Exams", "description": "CTET, TET, or state exams", "resources": ["https://ctet.nic.in/", "State Education Boards"], "duration": "6 months"},
+            {"id": "5", "title": "Teaching Position", "description": "School or college appointment", "resources": ["Government Schools", "Private Schools"], "duration": "Career Start"},
+            {"id": "6", "title": "Professional Development", "description": "M.Ed, research, or administration", "resources": ["Universities", "Professional Courses"], "duration": "Ongoing"}
+        ]
+    },
+    {
+        "title": "Designer",
+        "stream": "Arts",
+        "description": "Graphic, UI/UX, or product design career",
+        "estimated_duration": "3-5 years",
+        "difficulty_level": "Intermediate",
+        "steps": [
+            {"id": "1", "title": "Foundation Skills", "description": "Art, drawing, design fundamentals", "resources": ["Art Schools", "https://www.skillshare.com/"], "duration": "6-12 months"},
+            {"id": "2", "title": "Design Software", "description": "Adobe Creative Suite, Figma", "resources": ["https://www.adobe.com/", "https://www.figma.com/"], "duration": "3-6 months"},
+            {"id": "3", "title": "Formal Education", "description": "B.Des, Diploma in Design", "resources": ["NIFT", "Design Colleges"], "duration": "3-4 years"},
+            {"id": "4", "title": "Portfolio Development", "description": "Build strong design portfolio", "resources": ["https://www.behance.net/", "https://dribbble.com/"], "duration": "Ongoing"},
+            {"id": "5", "title": "Specialization", "description": "Choose UI/UX, Graphic, Product Design", "resources": ["https://www.coursera.org/", "https://www.unacademy.com/"], "duration": "6-12 months"},
+            {"id": "6", "title": "Professional Work", "description": "Design studio or freelance career", "resources": ["Design Agencies", "Freelance Platforms"], "duration": "Career Start"}
+        ]
+    },
+    {
+        "title": "Journalist",
+        "stream": "Arts",
+        "description": "Media and journalism career path",
+        "estimated_duration": "3-4 years",
+        "difficulty_level": "Intermediate",
+        "steps": [
+            {"id": "1", "title": "Bachelor's Degree", "description": "Journalism, Mass Communication, English", "resources": ["Journalism Schools", "Universities"], "duration": "3 years"},
+            {"id": "2", "title": "Writing Skills", "description": "News writing, reporting, editing", "resources": ["https://www.coursera.org/", "Writing Workshops"], "duration": "6-12 months"},
+            {"id": "3", "title": "Media Training", "description": "Video, audio, digital media skills", "resources": ["Media Training Institutes", "Online Courses"], "duration": "3-6 months"},
+            {"id": "4", "title": "Internships", "description": "Newspaper, TV, online media internships", "resources": ["Media Houses", "News Organizations"], "duration": "6-12 months"},
+            {"id": "5", "title": "Beat Specialization", "description": "Politics, Sports, Entertainment, etc.", "resources": ["Professional Experience", "Networking"], "duration": "1-2 years"},
+            {"id": "6", "title": "Career Growth", "description": "Reporter, Editor, or Media Entrepreneur", "resources": ["Media Organizations", "Independent Media"], "duration": "Ongoing"}
+        ]
+    },
+    {
+        "title": "Psychologist",
+        "stream": "Arts",
+        "description": "Psychology and counseling career",
+        "estimated_duration": "5-7 years",
+        "difficulty_level": "Advanced",
+        "steps": [
+            {"id": "1", "title": "Bachelor's in Psychology", "description": "BA/B.Sc Psychology", "resources": ["Psychology Departments", "Universities"], "duration": "3 years"},
+            {"id": "2", "title": "Master's Degree", "description": "MA/M.Sc in Psychology", "resources": ["Psychology Colleges", "Universities"], "duration": "2 years"},
+            {"id": "3", "title": "Specialization", "description": "Clinical, Counseling, Organizational", "resources": ["Specialization Courses", "Professional Training"], "duration": "1-2 years"},
+            {"id": "4", "title": "Practical Training", "description": "Internships, supervised practice", "resources": ["Hospitals", "Clinics", "Counseling Centers"], "duration": "1 year"},
+            {"id": "5", "title": "Licensing", "description": "Professional registration and certification", "resources": ["Psychology Councils", "Professional Bodies"], "duration": "3-6 months"},
+            {"id": "6", "title": "Practice Setup", "description": "Private practice or institutional work", "resources": ["Healthcare Institutions", "Private Practice"], "duration": "Career Start"}
+        ]
+    },
+    {
+        "title": "Writer",
+        "stream": "Arts",
+        "description": "Creative and content writing career",
+        "estimated_duration": "2-4 years",
+        "difficulty_level": "Intermediate",
+        "steps": [
+            {"id": "1", "title": "Language Skills", "description": "Master language and grammar", "resources": ["Literature Courses", "Language Schools"], "duration": "Ongoing"},
+            {"id": "2", "title": "Writing Practice", "description": "Daily writing, different formats", "resources": ["Writing Communities", "https://www.wattpad.com/"], "duration": "6-12 months"},
+            {"id": "3", "title": "Education", "description": "English, Literature, or Journalism", "resources": ["Universities", "Literature Departments"], "duration": "3 years"},
+            {"id": "4", "title": "Portfolio Building", "description": "Published works, blog, articles", "resources": ["https://medium.com/", "Literary Magazines"], "duration": "1-2 years"},
+            {"id": "5", "title": "Specialization", "description": "Content, Creative, Technical Writing", "resources": ["https://www.coursera.org/", "Writing Courses"], "duration": "6-12 months"},
+            {"id": "6", "title": "Professional Career", "description": "Publisher, freelance, or content creator", "resources": ["Publishing Houses", "Content Agencies"], "duration": "Career Start"}
+        ]
+    }
+]
 
 # Initialize roadmaps data
 @api_router.post("/admin/init-roadmaps")
 async def initialize_roadmaps():
-    # Check if roadmaps already exist
-    existing = await db.roadmaps.count_documents({})
-    if existing > 0:
-        return {"message": "Roadmaps already initialized"}
-    
-    # Career roadmaps data will be inserted here
-    roadmaps_data = [
-        # Science Stream
-        {
-            "title": "Full Stack Developer",
-            "stream": "Science",
-            "description": "Complete path to becoming a full-stack web developer with modern technologies",
-            "estimated_duration": "12-18 months",
-            "difficulty_level": "Intermediate",
-            "steps": [
-                {"id": "1", "title": "Learn HTML & CSS Basics", "description": "Master HTML5 and CSS3 fundamentals", "resources": ["https://www.freecodecamp.org/", "https://developer.mozilla.org/"], "duration": "4-6 weeks"},
-                {"id": "2", "title": "JavaScript Fundamentals", "description": "Learn core JavaScript concepts", "resources": ["https://javascript.info/", "https://www.coursera.org/"], "duration": "6-8 weeks"},
-                {"id": "3", "title": "React.js", "description": "Build interactive user interfaces", "resources": ["https://reactjs.org/", "https://www.unacademy.com/"], "duration": "8-10 weeks"},
-                {"id": "4", "title": "Backend with Node.js", "description": "Server-side development", "resources": ["https://nodejs.org/", "https://swayam.gov.in/"], "duration": "6-8 weeks"},
-                {"id": "5", "title": "Database Management", "description": "Learn MongoDB and SQL", "resources": ["https://university.mongodb.com/", "https://www.coursera.org/"], "duration": "4-6 weeks"},
-                {"id": "6", "title": "Build Portfolio Projects", "description": "Create 3-5 full-stack applications", "resources": ["https://github.com/", "https://netlify.com/"], "duration": "8-12 weeks"}
-            ]
-        },
-        {
-            "title": "Data Scientist",
-            "stream": "Science", 
-            "description": "Become a data scientist with Python, ML, and analytics skills",
-            "estimated_duration": "15-24 months",
-            "difficulty_level": "Advanced",
-            "steps": [
-                {"id": "1", "title": "Python Programming", "description": "Master Python for data science", "resources": ["https://www.python.org/", "https://swayam.gov.in/"], "duration": "6-8 weeks"},
-                {"id": "2", "title": "Statistics & Mathematics", "description": "Linear algebra, calculus, statistics", "resources": ["https://www.khanacademy.org/", "https://www.coursera.org/"], "duration": "10-12 weeks"},
-                {"id": "3", "title": "Data Analysis Libraries", "description": "Pandas, NumPy, Matplotlib", "resources": ["https://pandas.pydata.org/", "https://www.unacademy.com/"], "duration": "6-8 weeks"},
-                {"id": "4", "title": "Machine Learning", "description": "Scikit-learn, supervised/unsupervised learning", "resources": ["https://scikit-learn.org/", "https://www.coursera.org/"], "duration": "12-16 weeks"},
-                {"id": "5", "title": "Deep Learning", "description": "Neural networks, TensorFlow/PyTorch", "resources": ["https://www.tensorflow.org/", "https://pytorch.org/"], "duration": "10-12 weeks"},
-                {"id": "6", "title": "Real Projects & Portfolio", "description": "Build data science projects", "resources": ["https://kaggle.com/", "https://github.com/"], "duration": "8-10 weeks"}
-            ]
-        },
-        {
-            "title": "Doctor (MBBS)",
-            "stream": "Science",
-            "description": "Medical career path through NEET and MBBS program",
-            "estimated_duration": "6-8 years",
-            "difficulty_level": "Advanced",
-            "steps": [
-                {"id": "1", "title": "Class 12 PCB", "description": "Physics, Chemistry, Biology with 90%+", "resources": ["https://ncert.nic.in/", "https://www.unacademy.com/"], "duration": "2 years"},
-                {"id": "2", "title": "NEET Preparation", "description": "Qualify NEET-UG exam", "resources": ["https://www.nta.ac.in/", "https://www.aakash.ac.in/"], "duration": "1-2 years"},
-                {"id": "3", "title": "MBBS Degree", "description": "5.5 years medical program", "resources": ["https://www.mciindia.org/", "Medical Colleges"], "duration": "5.5 years"},
-                {"id": "4", "title": "Internship", "description": "1 year mandatory internship", "resources": ["Teaching Hospitals", "Medical Institutions"], "duration": "1 year"},
-                {"id": "5", "title": "Medical Registration", "description": "Register with Medical Council", "resources": ["https://www.nmc.org.in/"], "duration": "3-6 months"},
-                {"id": "6", "title": "Specialization (Optional)", "description": "MD/MS through NEET-PG", "resources": ["https://www.nta.ac.in/", "Post Graduate Medical Colleges"], "duration": "3 years"}
-            ]
-        },
-        {
-            "title": "Engineer",
-            "stream": "Science",
-            "description": "Engineering career through JEE and B.Tech program",
-            "estimated_duration": "4-6 years",
-            "difficulty_level": "Intermediate",
-            "steps": [
-                {"id": "1", "title": "Class 12 PCM", "description": "Physics, Chemistry, Mathematics", "resources": ["https://ncert.nic.in/", "https://www.unacademy.com/"], "duration": "2 years"},
-                {"id": "2", "title": "JEE Preparation", "description": "JEE Main & Advanced preparation", "resources": ["https://www.nta.ac.in/", "https://www.fiitjee.com/"], "duration": "1-2 years"},
-                {"id": "3", "title": "B.Tech Degree", "description": "4-year engineering program", "resources": ["IITs", "NITs", "Engineering Colleges"], "duration": "4 years"},
-                {"id": "4", "title": "Internships & Projects", "description": "Gain practical experience", "resources": ["Industry Partners", "Research Labs"], "duration": "During B.Tech"},
-                {"id": "5", "title": "Technical Skills", "description": "Programming, design, analysis", "resources": ["https://www.coursera.org/", "https://swayam.gov.in/"], "duration": "Continuous"},
-                {"id": "6", "title": "Job/Higher Studies", "description": "Placement or M.Tech/MS", "resources": ["Campus Placements", "Gate Preparation"], "duration": "Final Year"}
-            ]
-        },
-        {
-            "title": "Biotechnologist",
-            "stream": "Science",
-            "description": "Career in biotechnology and life sciences",
-            "estimated_duration": "4-6 years",
-            "difficulty_level": "Intermediate",
-            "steps": [
-                {"id": "1", "title": "Class 12 PCB/PCM", "description": "Biology focus with chemistry", "resources": ["https://ncert.nic.in/", "https://www.unacademy.com/"], "duration": "2 years"},
-                {"id": "2", "title": "Entrance Exams", "description": "JEE Main, BITSAT, or university exams", "resources": ["https://www.nta.ac.in/", "University Websites"], "duration": "1 year"},
-                {"id": "3", "title": "B.Tech/B.Sc Biotechnology", "description": "Undergraduate degree in biotechnology", "resources": ["IITs", "NITs", "Biotechnology Colleges"], "duration": "4 years"},
-                {"id": "4", "title": "Laboratory Skills", "description": "Practical lab techniques", "resources": ["College Labs", "Industry Training"], "duration": "During Degree"},
-                {"id": "5", "title": "Research Projects", "description": "Undergraduate research experience", "resources": ["Research Institutes", "CSIR Labs"], "duration": "1-2 years"},
-                {"id": "6", "title": "Specialization/Job", "description": "M.Tech or industry position", "resources": ["GATE", "Campus Placements"], "duration": "2+ years"}
-            ]
-        },
-        
-        # Commerce Stream
-        {
-            "title": "Chartered Accountant",
-            "stream": "Commerce",
-            "description": "Professional CA qualification through ICAI",
-            "estimated_duration": "4-6 years",
-            "difficulty_level": "Advanced",
-            "steps": [
-                {"id": "1", "title": "Class 12 Commerce", "description": "Accountancy, Business Studies, Economics", "resources": ["https://ncert.nic.in/", "https://www.unacademy.com/"], "duration": "2 years"},
-                {"id": "2", "title": "CA Foundation", "description": "Entry level CA examination", "resources": ["https://www.icai.org/", "CA Coaching Institutes"], "duration": "6-12 months"},
-                {"id": "3", "title": "CA Intermediate", "description": "Middle level CA examination", "resources": ["https://www.icai.org/", "Self Study + Coaching"], "duration": "12-18 months"},
-                {"id": "4", "title": "Articleship Training", "description": "3 years practical training", "resources": ["CA Firms", "Corporate Houses"], "duration": "3 years"},
-                {"id": "5", "title": "CA Final", "description": "Final level CA examination", "resources": ["https://www.icai.org/", "Advanced Study"], "duration": "6-18 months"},
-                {"id": "6", "title": "Membership & Practice", "description": "ICAI membership and career start", "resources": ["https://www.icai.org/", "CA Firms"], "duration": "Ongoing"}
-            ]
-        },
-        {
-            "title": "Investment Banker",
-            "stream": "Commerce",
-            "description": "Career in investment banking and finance",
-            "estimated_duration": "4-6 years",
-            "difficulty_level": "Advanced",
-            "steps": [
-                {"id": "1", "title": "Bachelor's Degree", "description": "B.Com, BBA, or Economics", "resources": ["Commerce Colleges", "Universities"], "duration": "3 years"},
-                {"id": "2", "title": "Financial Knowledge", "description": "Learn markets, valuation, modeling", "resources": ["https://www.coursera.org/", "https://www.cfa institute.org/"], "duration": "1-2 years"},
-                {"id": "3", "title": "MBA/Finance Specialization", "description": "Master's in Finance/MBA", "resources": ["IIMs", "Top B-Schools"], "duration": "2 years"},
-                {"id": "4", "title": "Internships", "description": "Investment banking internships", "resources": ["Goldman Sachs", "Morgan Stanley", "Local Banks"], "duration": "Summer Terms"},
-                {"id": "5", "title": "Certifications", "description": "CFA, FRM certifications", "resources": ["https://www.cfainstitute.org/", "https://www.garp.org/"], "duration": "1-3 years"},
-                {"id": "6", "title": "Full-time Position", "description": "Analyst/Associate role", "resources": ["Investment Banks", "Financial Services"], "duration": "Career Start"}
-            ]
-        },
-        {
-            "title": "Business Analyst",
-            "stream": "Commerce",
-            "description": "Business analysis and consulting career",
-            "estimated_duration": "3-5 years",
-            "difficulty_level": "Intermediate",
-            "steps": [
-                {"id": "1", "title": "Bachelor's Degree", "description": "BBA, B.Com, or related field", "resources": ["Business Schools", "Universities"], "duration": "3 years"},
-                {"id": "2", "title": "Business Analysis Skills", "description": "Process mapping, requirements analysis", "resources": ["https://www.coursera.org/", "https://www.iiba.org/"], "duration": "6-12 months"},
-                {"id": "3", "title": "Technical Skills", "description": "SQL, Excel, Data Analysis tools", "resources": ["https://www.microsoft.com/", "https://www.tableau.com/"], "duration": "3-6 months"},
-                {"id": "4", "title": "Industry Experience", "description": "Internships and entry-level roles", "resources": ["Consulting Firms", "Corporations"], "duration": "1-2 years"},
-                {"id": "5", "title": "Certifications", "description": "CBAP, PMI-PBA certifications", "resources": ["https://www.iiba.org/", "https://www.pmi.org/"], "duration": "6-12 months"},
-                {"id": "6", "title": "Senior Roles", "description": "Senior BA or consultancy positions", "resources": ["Career Progression", "Networking"], "duration": "Ongoing"}
-            ]
-        },
-        {
-            "title": "Marketing Manager",
-            "stream": "Commerce",
-            "description": "Digital and traditional marketing career path",
-            "estimated_duration": "4-6 years",
-            "difficulty_level": "Intermediate",
-            "steps": [
-                {"id": "1", "title": "Bachelor's Degree", "description": "Marketing, BBA, Mass Communication", "resources": ["Business Schools", "Universities"], "duration": "3 years"},
-                {"id": "2", "title": "Digital Marketing Skills", "description": "SEO, SEM, Social Media Marketing", "resources": ["https://www.google.com/skillshop/", "https://www.hubspot.com/"], "duration": "3-6 months"},
-                {"id": "3", "title": "Marketing Analytics", "description": "Google Analytics, Marketing metrics", "resources": ["https://analytics.google.com/", "https://www.coursera.org/"], "duration": "2-4 months"},
-                {"id": "4", "title": "Industry Experience", "description": "Marketing executive/coordinator roles", "resources": ["Marketing Agencies", "Corporate Marketing"], "duration": "2-3 years"},
-                {"id": "5", "title": "Specialization", "description": "Brand, Digital, or Product Marketing", "resources": ["https://www.unacademy.com/", "Professional Courses"], "duration": "1-2 years"},
-                {"id": "6", "title": "Leadership Role", "description": "Marketing Manager position", "resources": ["Career Growth", "MBA Optional"], "duration": "Ongoing"}
-            ]
-        },
-        {
-            "title": "Entrepreneur",
-            "stream": "Commerce",
-            "description": "Start and scale your own business",
-            "estimated_duration": "Varies (3+ years)",
-            "difficulty_level": "Advanced",
-            "steps": [
-                {"id": "1", "title": "Business Education", "description": "BBA, B.Com or relevant field", "resources": ["Business Schools", "Online Courses"], "duration": "3 years"},
-                {"id": "2", "title": "Idea Development", "description": "Identify market opportunity", "resources": ["https://www.startupindia.gov.in/", "Market Research"], "duration": "3-6 months"},
-                {"id": "3", "title": "Business Plan", "description": "Create comprehensive business plan", "resources": ["https://www.score.org/", "Business Plan Tools"], "duration": "2-4 months"},
-                {"id": "4", "title": "Funding & Setup", "description": "Secure funding and legal setup", "resources": ["Angel Investors", "https://www.startupindia.gov.in/"], "duration": "3-12 months"},
-                {"id": "5", "title": "Launch & Operations", "description": "Launch product/service and operations", "resources": ["Incubators", "Mentorship Programs"], "duration": "6-18 months"},
-                {"id": "6", "title": "Scale & Growth", "description": "Expand business and scale operations", "resources": ["Business Networks", "Growth Strategies"], "duration": "Ongoing"}
-            ]
-        },
-        
-        # Arts Stream
-        {
-            "title": "Teacher",
-            "stream": "Arts",
-            "description": "Teaching career in schools and higher education",
-            "estimated_duration": "4-6 years",
-            "difficulty_level": "Intermediate",
-            "steps": [
-                {"id": "1", "title": "Bachelor's Degree", "description": "BA in subject of interest", "resources": ["Universities", "Arts Colleges"], "duration": "3 years"},
-                {"id": "2", "title": "B.Ed Degree", "description": "Bachelor of Education", "resources": ["Education Colleges", "Universities"], "duration": "2 years"},
-                {"id": "3", "title": "Teaching Practice", "description": "Student teaching and practice", "resources": ["Practice Schools", "Internship Programs"], "duration": "During B.Ed"},
-                {"id": "4", "title": "Qualification Exams", "description": "CTET, TET, or state exams", "resources": ["https://ctet.nic.in/", "State Education Boards"], "duration": "6 months"},
-                {"id": "5", "title": "Teaching Position", "description": "School or college appointment", "resources": ["Government Schools", "Private Schools"], "duration": "Career Start"},
-                {"id": "6", "title": "Professional Development", "description": "M.Ed, research, or administration", "resources": ["Universities", "Professional Courses"], "duration": "Ongoing"}
-            ]
-        },
-        {
-            "title": "Designer",
-            "stream": "Arts",
-            "description": "Graphic, UI/UX, or product design career",
-            "estimated_duration": "3-5 years",
-            "difficulty_level": "Intermediate",
-            "steps": [
-                {"id": "1", "title": "Foundation Skills", "description": "Art, drawing, design fundamentals", "resources": ["Art Schools", "https://www.skillshare.com/"], "duration": "6-12 months"},
-                {"id": "2", "title": "Design Software", "description": "Adobe Creative Suite, Figma", "resources": ["https://www.adobe.com/", "https://www.figma.com/"], "duration": "3-6 months"},
-                {"id": "3", "title": "Formal Education", "description": "B.Des, Diploma in Design", "resources": ["NIFT", "Design Colleges"], "duration": "3-4 years"},
-                {"id": "4", "title": "Portfolio Development", "description": "Build strong design portfolio", "resources": ["https://www.behance.net/", "https://dribbble.com/"], "duration": "Ongoing"},
-                {"id": "5", "title": "Specialization", "description": "Choose UI/UX, Graphic, Product Design", "resources": ["https://www.coursera.org/", "https://www.unacademy.com/"], "duration": "6-12 months"},
-                {"id": "6", "title": "Professional Work", "description": "Design studio or freelance career", "resources": ["Design Agencies", "Freelance Platforms"], "duration": "Career Start"}
-            ]
-        },
-        {
-            "title": "Journalist",
-            "stream": "Arts",
-            "description": "Media and journalism career path",
-            "estimated_duration": "3-4 years",
-            "difficulty_level": "Intermediate",
-            "steps": [
-                {"id": "1", "title": "Bachelor's Degree", "description": "Journalism, Mass Communication, English", "resources": ["Journalism Schools", "Universities"], "duration": "3 years"},
-                {"id": "2", "title": "Writing Skills", "description": "News writing, reporting, editing", "resources": ["https://www.coursera.org/", "Writing Workshops"], "duration": "6-12 months"},
-                {"id": "3", "title": "Media Training", "description": "Video, audio, digital media skills", "resources": ["Media Training Institutes", "Online Courses"], "duration": "3-6 months"},
-                {"id": "4", "title": "Internships", "description": "Newspaper, TV, online media internships", "resources": ["Media Houses", "News Organizations"], "duration": "6-12 months"},
-                {"id": "5", "title": "Beat Specialization", "description": "Politics, Sports, Entertainment, etc.", "resources": ["Professional Experience", "Networking"], "duration": "1-2 years"},
-                {"id": "6", "title": "Career Growth", "description": "Reporter, Editor, or Media Entrepreneur", "resources": ["Media Organizations", "Independent Media"], "duration": "Ongoing"}
-            ]
-        },
-        {
-            "title": "Psychologist",
-            "stream": "Arts",
-            "description": "Psychology and counseling career",
-            "estimated_duration": "5-7 years",
-            "difficulty_level": "Advanced",
-            "steps": [
-                {"id": "1", "title": "Bachelor's in Psychology", "description": "BA/B.Sc Psychology", "resources": ["Psychology Departments", "Universities"], "duration": "3 years"},
-                {"id": "2", "title": "Master's Degree", "description": "MA/M.Sc in Psychology", "resources": ["Psychology Colleges", "Universities"], "duration": "2 years"},
-                {"id": "3", "title": "Specialization", "description": "Clinical, Counseling, Organizational", "resources": ["Specialization Courses", "Professional Training"], "duration": "1-2 years"},
-                {"id": "4", "title": "Practical Training", "description": "Internships, supervised practice", "resources": ["Hospitals", "Clinics", "Counseling Centers"], "duration": "1 year"},
-                {"id": "5", "title": "Licensing", "description": "Professional registration and certification", "resources": ["Psychology Councils", "Professional Bodies"], "duration": "3-6 months"},
-                {"id": "6", "title": "Practice Setup", "description": "Private practice or institutional work", "resources": ["Healthcare Institutions", "Private Practice"], "duration": "Career Start"}
-            ]
-        },
-        {
-            "title": "Writer",
-            "stream": "Arts",
-            "description": "Creative and content writing career",
-            "estimated_duration": "2-4 years",
-            "difficulty_level": "Intermediate",
-            "steps": [
-                {"id": "1", "title": "Language Skills", "description": "Master language and grammar", "resources": ["Literature Courses", "Language Schools"], "duration": "Ongoing"},
-                {"id": "2", "title": "Writing Practice", "description": "Daily writing, different formats", "resources": ["Writing Communities", "https://www.wattpad.com/"], "duration": "6-12 months"},
-                {"id": "3", "title": "Education", "description": "English, Literature, or Journalism", "resources": ["Universities", "Literature Departments"], "duration": "3 years"},
-                {"id": "4", "title": "Portfolio Building", "description": "Published works, blog, articles", "resources": ["https://medium.com/", "Literary Magazines"], "duration": "1-2 years"},
-                {"id": "5", "title": "Specialization", "description": "Content, Creative, Technical Writing", "resources": ["https://www.coursera.org/", "Writing Courses"], "duration": "6-12 months"},
-                {"id": "6", "title": "Professional Career", "description": "Publisher, freelance, or content creator", "resources": ["Publishing Houses", "Content Agencies"], "duration": "Career Start"}
-            ]
-        }
+    # Idempotent upsert keyed on (title, stream) - the seed docs carry no
+    # natural id field. One unordered wire batch, safe to re-run, and a
+    # duplicate never aborts the rest of the batch. $setOnInsert leaves
+    # already-seeded documents untouched.
+    ops = [
+        UpdateOne(
+            {"title": roadmap["title"], "stream": roadmap["stream"]},
+            {"$setOnInsert": roadmap},
+            upsert=True
+        )
+        for roadmap in ROADMAPS_DATA
     ]
-    
-    # Insert all roadmaps
-    result = await db.roadmaps.insert_many(roadmaps_data)
-    return {"message": f"Initialized {len(result.inserted_ids)} career roadmaps successfully"}
+    result = await db.roadmaps.bulk_write(ops, ordered=False)
+    await refresh_roadmap_cache()
+    if result.upserted_count == 0:
+        return {"message": "Roadmaps already initialized"}
+    return {"message": f"Initialized {result.upserted_count} career roadmaps successfully"}
 
 # Include the router in the main app
 app.include_router(api_router)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def ping_mongo():
+    # Fail fast at boot if Mongo is unreachable instead of on the first request
+    await client.admin.command("ping")
+
+@app.on_event("startup")
+async def ensure_indexes():
+    # Every lookup path gets an index: login by email (strength=2 collation
+    # for case-insensitive point queries), per-user progress reads (compound
+    # prefix also covers user-only queries), the (title, stream) seed
+    # upserts, and stream-filtered roadmap lists. create_index is
+    # idempotent, so the builds run concurrently.
+    await asyncio.gather(
+        db.users.create_index("email", unique=True, collation=EMAIL_COLLATION),
+        db.progress.create_index([("user_id", 1), ("career_id", 1)], unique=True),
+        db.roadmaps.create_index([("title", 1), ("stream", 1)], unique=True),
+        db.roadmaps.create_index("stream"),
+    )
+
+@app.on_event("startup")
+async def load_roadmap_cache():
+    await refresh_roadmap_cache()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    client.close()
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # Logging is only configured when the module is run directly; under a
+    # managed uvicorn the server's own log config applies and importing this
+    # module stays free of side effects.
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    # uvloop and httptools swap the stdlib event loop and HTTP parser for
+    # their C implementations
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
\ No newline at end of file
@@ -4,75 +4,98 @@ Comprehensive Backend API Testing for Indian Career Roadmap Application
 Tests all authentication, user profile, roadmaps, and progress tracking endpoints
 """
 
-import requests
+import aiohttp
+import asyncio
 import json
 import sys
-from datetime import datetime
-import uuid
+import time
+from datetime import datetime, timedelta
+import secrets
 
 # Base URL from frontend environment
 BASE_URL = "https://path-finder-in.preview.emergentagent.com/api"
 
-class APITester:
+RETRY_STATUSES = {502, 503, 504}
+MAX_RETRIES = 3
+
+
+class APIResponse:
+    """Materialized response so tests can inspect it after the connection is released"""
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncAPITester:
     def __init__(self):
         self.base_url = BASE_URL
-        self.session = requests.Session()
+        self.session = None  # bound in run_all_tests
         self.auth_token = None
         self.user_data = None
         self.test_results = []
-        
+        self._out = []
+        # Wall-clock anchor for lazy timestamp formatting in the summary;
+        # the hot logging path only records a monotonic integer
+        self._start_wall = datetime.now()
+        self._start_ns = time.monotonic_ns()
+
+    def _emit(self, line):
+        """Buffer an output line; everything is flushed once in generate_summary"""
+        self._out.append(line)
+
     def log_test(self, test_name, success, message, response_data=None):
         """Log test results"""
         result = {
             "test": test_name,
             "success": success,
             "message": message,
-            "timestamp": datetime.now().isoformat()
+            "ts_ns": time.monotonic_ns()
         }
         if response_data:
             result["response"] = response_data
         self.test_results.append(result)
-        
+
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}: {message}")
-        
-    def make_request(self, method, endpoint, data=None, headers=None):
-        """Make HTTP request with error handling"""
+        self._emit(f"{status} {test_name}: {message}")
+
+    async def make_request(self, method, endpoint, data=None, headers=None, auth=True):
+        """Make HTTP request with error handling and transient-error retries
+
+        auth=False sends the request anonymously; tests use it instead of
+        mutating self.auth_token, which would race with concurrent tests.
+        """
         url = f"{self.base_url}{endpoint}"
-        
+
+        if headers is None:
+            headers = {}
+
+        if auth and self.auth_token:
+            headers["Authorization"] = f"Bearer {self.auth_token}"
+
         try:
-            if headers is None:
-                headers = {}
-            
-            if self.auth_token:
-                headers["Authorization"] = f"Bearer {self.auth_token}"
-            
-            headers["Content-Type"] = "application/json"
-            
-            if method.upper() == "GET":
-                response = self.session.get(url, headers=headers)
-            elif method.upper() == "POST":
-                response = self.session.post(url, json=data, headers=headers)
-            elif method.upper() == "PUT":
-                response = self.session.put(url, json=data, headers=headers)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-                
-            return response
-            
-        except requests.exceptions.RequestException as e:
+            for attempt in range(MAX_RETRIES):
+                async with self.session.request(method.upper(), url, json=data, headers=headers) as response:
+                    if response.status in RETRY_STATUSES and attempt < MAX_RETRIES - 1:
+                        await asyncio.sleep(0.2 * (attempt + 1))
+                        continue
+                    return APIResponse(response.status, await response.text())
+
+        except aiohttp.ClientError:
             return None
-    
-    def test_admin_init_roadmaps(self):
+
+    async def test_admin_init_roadmaps(self):
         """Test admin roadmaps initialization"""
-        print("\n=== Testing Admin Roadmaps Initialization ===")
-        
-        response = self.make_request("POST", "/admin/init-roadmaps")
-        
+        self._emit("\n=== Testing Admin Roadmaps Initialization ===")
+
+        response = await self.make_request("POST", "/admin/init-roadmaps")
+
         if response is None:
             self.log_test("Admin Init Roadmaps", False, "Network error - could not connect to server")
             return False
-            
+
         if response.status_code == 200:
             data = response.json()
             self.log_test("Admin Init Roadmaps", True, f"Roadmaps initialized: {data.get('message', 'Success')}")
@@ -80,25 +103,25 @@ class APITester:
         else:
             self.log_test("Admin Init Roadmaps", False, f"HTTP {response.status_code}: {response.text}")
             return False
-    
-    def test_user_registration(self):
+
+    async def test_user_registration(self):
         """Test user registration"""
-        print("\n=== Testing User Registration ===")
-        
+        self._emit("\n=== Testing User Registration ===")
+
         # Generate unique test data
-        unique_id = str(uuid.uuid4())[:8]
+        unique_id = secrets.token_hex(4)
         test_user = {
             "name": f"Arjun Sharma {unique_id}",
             "email": f"arjun.sharma.{unique_id}@gmail.com",
             "password": "SecurePass123!"
         }
-        
-        response = self.make_request("POST", "/auth/register", test_user)
-        
+
+        response = await self.make_request("POST", "/auth/register", test_user)
+
         if response is None:
             self.log_test("User Registration", False, "Network error - could not connect to server")
             return False
-            
+
         if response.status_code == 200:
             data = response.json()
             if "access_token" in data and "user" in data:
@@ -112,32 +135,29 @@ class APITester:
         else:
             self.log_test("User Registration", False, f"HTTP {response.status_code}: {response.text}")
             return False
-    
-    def test_user_login(self):
+
+    async def test_user_login(self):
         """Test user login with registered credentials"""
-        print("\n=== Testing User Login ===")
-        
+        self._emit("\n=== Testing User Login ===")
+
         if not self.user_data:
             self.log_test("User Login", False, "No user data available for login test")
             return False
-            
+
         # Extract email from registered user
         login_data = {
             "email": self.user_data["email"],
             "password": "SecurePass123!"
         }
-        
-        # Clear token to test fresh login
-        old_token = self.auth_token
-        self.auth_token = None
-        
-        response = self.make_request("POST", "/auth/login", login_data)
-        
+
+        # Fresh login without the registration token; the existing token is
+        # left in place unless login succeeds
+        response = await self.make_request("POST", "/auth/login", login_data, auth=False)
+
         if response is None:
             self.log_test("User Login", False, "Network error - could not connect to server")
-            self.auth_token = old_token  # Restore token
             return False
-            
+
         if response.status_code == 200:
             data = response.json()
             if "access_token" in data and "user" in data:
@@ -146,27 +166,25 @@ class APITester:
                 return True
             else:
                 self.log_test("User Login", False, "Missing access_token or user in response")
-                self.auth_token = old_token  # Restore token
                 return False
         else:
             self.log_test("User Login", False, f"HTTP {response.status_code}: {response.text}")
-            self.auth_token = old_token  # Restore token
             return False
-    
-    def test_get_current_user(self):
+
+    async def test_get_current_user(self):
         """Test getting current user info"""
-        print("\n=== Testing Get Current User ===")
-        
+        self._emit("\n=== Testing Get Current User ===")
+
         if not self.auth_token:
             self.log_test("Get Current User", False, "No auth token available")
             return False
-            
-        response = self.make_request("GET", "/auth/me")
-        
+
+        response = await self.make_request("GET", "/auth/me")
+
         if response is None:
             self.log_test("Get Current User", False, "Network error - could not connect to server")
             return False
-            
+
         if response.status_code == 200:
             data = response.json()
             if "id" in data and "name" in data and "email" in data:
@@ -178,23 +196,23 @@ class APITester:
         else:
             self.log_test("Get Current User", False, f"HTTP {response.status_code}: {response.text}")
             return False
-    
-    def test_update_user_stream(self):
+
+    async def test_update_user_stream(self):
         """Test updating user stream preference"""
-        print("\n=== Testing Update User Stream ===")
-        
+        self._emit("\n=== Testing Update User Stream ===")
+
         if not self.auth_token:
             self.log_test("Update User Stream", False, "No auth token available")
             return False
-            
+
         stream_data = {"stream": "Science"}
-        
-        response = self.make_request("PUT", "/user/stream", stream_data)
-        
+
+        response = await self.make_request("PUT", "/user/stream", stream_data)
+
         if response is None:
             self.log_test("Update User Stream", False, "Network error - could not connect to server")
             return False
-            
+
         if response.status_code == 200:
             data = response.json()
             if data.get("stream") == "Science":
@@ -206,17 +224,17 @@ class APITester:
         else:
             self.log_test("Update User Stream", False, f"HTTP {response.status_code}: {response.text}")
             return False
-    
-    def test_get_all_roadmaps(self):
+
+    async def test_get_all_roadmaps(self):
         """Test getting all career roadmaps"""
-        print("\n=== Testing Get All Roadmaps ===")
-        
-        response = self.make_request("GET", "/roadmaps")
-        
+        self._emit("\n=== Testing Get All Roadmaps ===")
+
+        response = await self.make_request("GET", "/roadmaps")
+
         if response is None:
             self.log_test("Get All Roadmaps", False, "Network error - could not connect to server")
             return False, []
-            
+
         if response.status_code == 200:
             data = response.json()
             if isinstance(data, list) and len(data) > 0:
@@ -228,48 +246,52 @@ class APITester:
         else:
             self.log_test("Get All Roadmaps", False, f"HTTP {response.status_code}: {response.text}")
             return False, []
-    
-    def test_get_science_roadmaps(self):
+
+    async def test_get_science_roadmaps(self):
         """Test getting Science stream roadmaps"""
-        print("\n=== Testing Get Science Stream Roadmaps ===")
-        
-        response = self.make_request("GET", "/roadmaps?stream=Science")
-        
+        self._emit("\n=== Testing Get Science Stream Roadmaps ===")
+
+        response = await self.make_request("GET", "/roadmaps?stream=Science")
+
         if response is None:
             self.log_test("Get Science Roadmaps", False, "Network error - could not connect to server")
             return False
-            
+
         if response.status_code == 200:
             data = response.json()
             if isinstance(data, list):
-                science_count = len([r for r in data if r.get("stream") == "Science"])
-                self.log_test("Get Science Roadmaps", True, f"Retrieved {science_count} Science roadmaps")
-                return True
+                # Filtering happens server-side in Mongo; just assert it did
+                if all(r.get("stream") == "Science" for r in data):
+                    self.log_test("Get Science Roadmaps", True, f"Retrieved {len(data)} Science roadmaps")
+                    return True
+                else:
+                    self.log_test("Get Science Roadmaps", False, "Response contains non-Science roadmaps")
+                    return False
             else:
                 self.log_test("Get Science Roadmaps", False, "Invalid response format")
                 return False
         else:
             self.log_test("Get Science Roadmaps", False, f"HTTP {response.status_code}: {response.text}")
             return False
-    
-    def test_get_specific_roadmap(self, roadmaps):
+
+    async def test_get_specific_roadmap(self, roadmaps):
         """Test getting specific roadmap details"""
-        print("\n=== Testing Get Specific Roadmap ===")
-        
+        self._emit("\n=== Testing Get Specific Roadmap ===")
+
         if not roadmaps:
             self.log_test("Get Specific Roadmap", False, "No roadmaps available for testing")
             return False, None
-            
+
         # Use first roadmap for testing
         test_roadmap = roadmaps[0]
         roadmap_id = test_roadmap["id"]
-        
-        response = self.make_request("GET", f"/roadmaps/{roadmap_id}")
-        
+
+        response = await self.make_request("GET", f"/roadmaps/{roadmap_id}")
+
         if response is None:
             self.log_test("Get Specific Roadmap", False, "Network error - could not connect to server")
             return False, None
-            
+
         if response.status_code == 200:
             data = response.json()
             if "id" in data and "title" in data and "steps" in data:
@@ -281,19 +303,19 @@ class APITester:
         else:
             self.log_test("Get Specific Roadmap", False, f"HTTP {response.status_code}: {response.text}")
             return False, None
-    
-    def test_update_progress(self, roadmap):
+
+    async def test_update_progress(self, roadmap):
         """Test updating step completion progress"""
-        print("\n=== Testing Update Progress ===")
-        
+        self._emit("\n=== Testing Update Progress ===")
+
         if not self.auth_token:
             self.log_test("Update Progress", False, "No auth token available")
             return False
-            
+
         if not roadmap or "steps" not in roadmap:
             self.log_test("Update Progress", False, "No roadmap data available for testing")
             return False
-            
+
         # Mark first step as completed
         first_step = roadmap["steps"][0]
         progress_data = {
@@ -301,13 +323,13 @@ class APITester:
             "step_id": first_step["id"],
             "completed": True
         }
-        
-        response = self.make_request("POST", "/progress", progress_data)
-        
+
+        response = await self.make_request("POST", "/progress", progress_data)
+
         if response is None:
             self.log_test("Update Progress", False, "Network error - could not connect to server")
             return False
-            
+
         if response.status_code == 200:
             data = response.json()
             if "message" in data:
@@ -319,21 +341,21 @@ class APITester:
         else:
             self.log_test("Update Progress", False, f"HTTP {response.status_code}: {response.text}")
             return False
-    
-    def test_get_user_progress(self):
+
+    async def test_get_user_progress(self):
         """Test getting user's overall progress"""
-        print("\n=== Testing Get User Progress ===")
-        
+        self._emit("\n=== Testing Get User Progress ===")
+
         if not self.auth_token:
             self.log_test("Get User Progress", False, "No auth token available")
             return False
-            
-        response = self.make_request("GET", "/progress")
-        
+
+        response = await self.make_request("GET", "/progress")
+
         if response is None:
             self.log_test("Get User Progress", False, "Network error - could not connect to server")
             return False
-            
+
         if response.status_code == 200:
             data = response.json()
             if isinstance(data, list):
@@ -345,25 +367,25 @@ class APITester:
         else:
             self.log_test("Get User Progress", False, f"HTTP {response.status_code}: {response.text}")
             return False
-    
-    def test_get_career_progress(self, career_id):
+
+    async def test_get_career_progress(self, career_id):
         """Test getting progress for specific career"""
-        print("\n=== Testing Get Career Progress ===")
-        
+        self._emit("\n=== Testing Get Career Progress ===")
+
         if not self.auth_token:
             self.log_test("Get Career Progress", False, "No auth token available")
             return False
-            
+
         if not career_id:
             self.log_test("Get Career Progress", False, "No career ID available for testing")
             return False
-            
-        response = self.make_request("GET", f"/progress/{career_id}")
-        
+
+        response = await self.make_request("GET", f"/progress/{career_id}")
+
         if response is None:
             self.log_test("Get Career Progress", False, "Network error - could not connect to server")
             return False
-            
+
         if response.status_code == 200:
             data = response.json()
             if "user_id" in data and "career_id" in data:
@@ -376,114 +398,141 @@ class APITester:
         else:
             self.log_test("Get Career Progress", False, f"HTTP {response.status_code}: {response.text}")
             return False
-    
-    def test_invalid_login(self):
+
+    async def test_invalid_login(self):
         """Test login with invalid credentials"""
-        print("\n=== Testing Invalid Login ===")
-        
+        self._emit("\n=== Testing Invalid Login ===")
+
         invalid_data = {
             "email": "nonexistent@example.com",
             "password": "wrongpassword"
         }
-        
-        response = self.make_request("POST", "/auth/login", invalid_data)
-        
+
+        response = await self.make_request("POST", "/auth/login", invalid_data, auth=False)
+
         if response is None:
             self.log_test("Invalid Login Test", False, "Network error - could not connect to server")
             return False
-            
+
         if response.status_code == 401:
             self.log_test("Invalid Login Test", True, "Correctly rejected invalid credentials")
             return True
         else:
             self.log_test("Invalid Login Test", False, f"Expected 401, got {response.status_code}")
             return False
-    
-    def test_unauthorized_access(self):
+
+    async def test_unauthorized_access(self):
         """Test accessing protected endpoint without token"""
-        print("\n=== Testing Unauthorized Access ===")
-        
-        # Temporarily remove token
-        old_token = self.auth_token
-        self.auth_token = None
-        
-        response = self.make_request("GET", "/auth/me")
-        
-        # Restore token
-        self.auth_token = old_token
-        
+        self._emit("\n=== Testing Unauthorized Access ===")
+
+        response = await self.make_request("GET", "/auth/me", auth=False)
+
         if response is None:
             self.log_test("Unauthorized Access Test", False, "Network error - could not connect to server")
             return False
-            
+
         if response.status_code == 401 or response.status_code == 403:
             self.log_test("Unauthorized Access Test", True, "Correctly rejected unauthorized access")
             return True
         else:
             self.log_test("Unauthorized Access Test", False, f"Expected 401/403, got {response.status_code}")
             return False
-    
-    def run_all_tests(self):
+
+    async def run_all_tests(self):
         """Run comprehensive test suite"""
-        print(f"🚀 Starting Indian Career Roadmap Backend API Tests")
-        print(f"📍 Base URL: {self.base_url}")
-        print("=" * 60)
-        
-        # Initialize roadmaps first
-        self.test_admin_init_roadmaps()
-        
-        # Authentication flow
-        if not self.test_user_registration():
-            print("❌ Registration failed - stopping tests")
-            return self.generate_summary()
-            
-        self.test_user_login()
-        self.test_get_current_user()
-        
-        # User profile
-        self.test_update_user_stream()
-        
-        # Roadmaps
-        success, roadmaps = self.test_get_all_roadmaps()
-        self.test_get_science_roadmaps()
-        
-        roadmap = None
-        if success and roadmaps:
-            success, roadmap = self.test_get_specific_roadmap(roadmaps)
-        
-        # Progress tracking
-        if roadmap:
-            self.test_update_progress(roadmap)
-            self.test_get_user_progress()
-            self.test_get_career_progress(roadmap["id"])
-        
-        # Error cases
-        self.test_invalid_login()
-        self.test_unauthorized_access()
-        
+        self._emit(f"🚀 Starting Indian Career Roadmap Backend API Tests")
+        self._emit(f"📍 Base URL: {self.base_url}")
+        self._emit("=" * 60)
+
+        connector = aiohttp.TCPConnector(limit=64, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            self.session = session
+
+            # Error cases need no auth or seeded data; run them in the
+            # background for the whole suite and collect them at the end
+            error_case_tasks = [
+                asyncio.create_task(self.test_invalid_login()),
+                asyncio.create_task(self.test_unauthorized_access()),
+            ]
+
+            try:
+                # Initialize roadmaps first
+                await self.test_admin_init_roadmaps()
+
+                # Authentication flow (strictly serial: each step feeds the next)
+                if not await self.test_user_registration():
+                    self._emit("❌ Registration failed - stopping tests")
+                else:
+                    await self.test_user_login()
+                    await self.test_get_current_user()
+
+                    # User profile
+                    await self.test_update_user_stream()
+
+                    # Independent read-only tests overlap their round-trips
+                    (success, roadmaps), _ = await asyncio.gather(
+                        self.test_get_all_roadmaps(),
+                        self.test_get_science_roadmaps(),
+                    )
+
+                    roadmap = None
+                    if success and roadmaps:
+                        success, roadmap = await self.test_get_specific_roadmap(roadmaps)
+
+                    # Progress tracking
+                    if roadmap:
+                        await self.test_update_progress(roadmap)
+                        await self.test_get_user_progress()
+
+                        # Fan out per-career progress reads, gated so we don't
+                        # flood the server with one request per seeded roadmap
+                        semaphore = asyncio.Semaphore(16)
+
+                        async def gated_progress(career_id):
+                            async with semaphore:
+                                return await self.test_get_career_progress(career_id)
+
+                        await asyncio.gather(*(gated_progress(r["id"]) for r in roadmaps))
+            finally:
+                # Collect the background error-case tests before the session
+                # closes under them — on the early-exit path too
+                await asyncio.gather(*error_case_tasks)
+
         return self.generate_summary()
-    
+
     def generate_summary(self):
         """Generate test summary"""
-        print("\n" + "=" * 60)
-        print("📊 TEST SUMMARY")
-        print("=" * 60)
-        
+        # Timestamps are formatted once here rather than per log_test call
+        for result in self.test_results:
+            elapsed_ns = result.pop("ts_ns")
+            result["timestamp"] = (
+                self._start_wall + timedelta(microseconds=(elapsed_ns - self._start_ns) / 1000)
+            ).isoformat()
+
+        self._emit("\n" + "=" * 60)
+        self._emit("📊 TEST SUMMARY")
+        self._emit("=" * 60)
+
         total_tests = len(self.test_results)
         passed_tests = len([t for t in self.test_results if t["success"]])
         failed_tests = total_tests - passed_tests
-        
-        print(f"Total Tests: {total_tests}")
-        print(f"✅ Passed: {passed_tests}")
-        print(f"❌ Failed: {failed_tests}")
-        print(f"Success Rate: {(passed_tests/total_tests*100):.1f}%")
-        
+
+        self._emit(f"Total Tests: {total_tests}")
+        self._emit(f"✅ Passed: {passed_tests}")
+        self._emit(f"❌ Failed: {failed_tests}")
+        self._emit(f"Success Rate: {(passed_tests/total_tests*100):.1f}%")
+
         if failed_tests > 0:
-            print("\n🔍 FAILED TESTS:")
+            self._emit("\n🔍 FAILED TESTS:")
             for test in self.test_results:
                 if not test["success"]:
-                    print(f"  • {test['test']}: {test['message']}")
-        
+                    self._emit(f"  • {test['test']}: {test['message']}")
+
+        # Single write instead of one syscall per line during the run
+        sys.stdout.write("\n".join(self._out) + "\n")
+        sys.stdout.flush()
+        self._out.clear()
+
         return {
             "total": total_tests,
             "passed": passed_tests,
@@ -494,9 +543,9 @@ class APITester:
 
 def main():
     """Main test execution"""
-    tester = APITester()
-    summary = tester.run_all_tests()
-    
+    tester = AsyncAPITester()
+    summary = asyncio.run(tester.run_all_tests())
+
     # Exit with error code if tests failed
     if summary["failed"] > 0:
         sys.exit(1)
@@ -505,4 +554,4 @@ def main():
         sys.exit(0)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
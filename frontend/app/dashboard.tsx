@@ -23,7 +23,7 @@ interface CareerRoadmap {
   title: string;
   stream: string;
   description: string;
-  steps: any[];
+  steps_count: number;
   estimated_duration: string;
   difficulty_level: string;
 }
@@ -301,7 +301,7 @@ export default function DashboardScreen() {
                       <View style={styles.stepsInfo}>
                         <Ionicons name="list-outline" size={16} color="rgba(255, 255, 255, 0.6)" />
                         <Text style={styles.stepsText}>
-                          {roadmap.steps.length} steps
+                          {roadmap.steps_count} steps
                         </Text>
                       </View>
                     </LinearGradient>